@@ -1,11 +1,232 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import httpx
+import hishel
+from hishel.httpx import SyncCacheTransport
+import aiohttp
+import aiofiles
+import asyncio
+from lxml import etree
+import lxml.html
+import codecs
+import contextlib
+import csv
+import hashlib
 import json
 from typing import Dict, List
 import os
-import urllib.parse
+import shutil
+import sys
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Lexbor is the fastest parser available; fall back to lxml without it
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# HTTP/2 needs the h2 package (httpx[http2]); use HTTP/1.1 without it
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# Only advertise brotli when it can be decoded by httpx and aiohttp
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# (tag, attribute, value) selectors, tried in order of preference
+TITLE_SELECTORS = [
+    ('h1', 'class', 'product-title'),
+    ('h1', 'class', 'title'),
+    ('div', 'class', 'product-name'),
+    ('div', 'class', 'detail-title')
+]
+DESCRIPTION_SELECTORS = [
+    ('div', 'class', 'product-description'),
+    ('div', 'class', 'description'),
+    ('div', 'class', 'detail-desc'),
+    ('div', 'id', 'description')
+]
+IMAGE_CONTAINER_SELECTORS = [
+    ('div', 'class', 'product-images'),
+    ('div', 'class', 'detail-gallery'),
+    ('div', 'class', 'product-gallery')
+]
+ALTERNATIVE_IMAGE_PATTERNS = ['product', 'goods', 'item', 'detail']
+# Elements whose contents are excluded from titles and descriptions
+SKIPPED_TEXT_TAGS = ['script', 'style']
+
+# Looser, substring-matching fallbacks for pages the selectors above miss,
+# compiled once and evaluated against a parsed tree
+TITLE_XPATH = etree.XPath(
+    "//h1[contains(@class,'product-title') or contains(@class,'title')]"
+    " | //div[contains(@class,'product-name') or contains(@class,'detail-title')]"
+)
+DESCRIPTION_XPATH = etree.XPath(
+    "//div[contains(@class,'product-description') or contains(@class,'description')"
+    " or contains(@class,'detail-desc') or @id='description']"
+)
+_GALLERY = ("//div[contains(@class,'product-images') or contains(@class,'detail-gallery')"
+            " or contains(@class,'product-gallery')]//img")
+IMAGES_XPATH = etree.XPath(f"{_GALLERY}/@src | {_GALLERY}[not(@src)]/@data-src")
+_LOWER = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+ALTERNATIVE_IMAGES_XPATH = etree.XPath(
+    "//img/@src[" + " or ".join(f"contains({_LOWER}, '{p}')" for p in ALTERNATIVE_IMAGE_PATTERNS) + "]"
+    " | //img/@data-src[. != '']"
+)
+
+
+def _css(selector: tuple) -> str:
+    """Render a (tag, attribute, value) selector as CSS"""
+    tag, attr, value = selector
+    if attr == 'class':
+        return f"{tag}.{value}"
+    return f"{tag}[{attr}='{value}']"
+
+
+# CSS forms of the selectors for the Lexbor parser
+TITLE_CSS = [_css(s) for s in TITLE_SELECTORS]
+DESCRIPTION_CSS = [_css(s) for s in DESCRIPTION_SELECTORS]
+IMAGE_CONTAINER_CSS = [_css(s) for s in IMAGE_CONTAINER_SELECTORS]
+# CSS equivalents of the XPath fallbacks above
+TITLE_FALLBACK_CSS = ("h1[class*='product-title'], h1[class*='title'],"
+                      " div[class*='product-name'], div[class*='detail-title']")
+DESCRIPTION_FALLBACK_CSS = ("div[class*='product-description'], div[class*='description'],"
+                            " div[class*='detail-desc'], div[id='description']")
+IMAGES_FALLBACK_CSS = ("div[class*='product-images'] img, div[class*='detail-gallery'] img,"
+                       " div[class*='product-gallery'] img")
+CSV_FIELDNAMES = ['sku', 'title', 'description', 'image_urls', 'local_image_paths', 'url']
+
+
+def _matches(selector: tuple, tag: str, attrs: Dict) -> bool:
+    """Check a (tag, attribute, value) selector against a start tag"""
+    sel_tag, sel_attr, sel_value = selector
+    if tag != sel_tag:
+        return False
+    if sel_attr == 'class':
+        return sel_value in attrs.get('class', '').split()
+    return attrs.get(sel_attr) == sel_value
+
+
+def _unique_urls(urls) -> List[str]:
+    """Drop empty and repeated URLs, keeping first-seen order"""
+    seen = set()
+    images = []
+    for url in urls:
+        if not url:
+            continue
+        url = str(url)
+        if url not in seen:
+            seen.add(url)
+            images.append(url)
+    return images
+
+
+class CJTarget:
+    """
+    lxml parser target that collects product details from SAX-style events,
+    so no document tree is built for a product page
+    """
+    def __init__(self):
+        self.titles = [None] * len(TITLE_SELECTORS)
+        self.descriptions = [None] * len(DESCRIPTION_SELECTORS)
+        self.galleries = [None] * len(IMAGE_CONTAINER_SELECTORS)
+        # One entry per open element: the capture lists it pushed onto
+        self.stack = []
+        self.text_captures = []
+        self.gallery_captures = []
+        # Depth inside script/style elements, whose contents are not page text
+        self.skip_depth = 0
+
+    def start(self, tag, attrs):
+        if tag in SKIPPED_TEXT_TAGS:
+            self.skip_depth += 1
+        opened = []
+        # Only the first element matching each selector is captured
+        for selectors, found in ((TITLE_SELECTORS, self.titles),
+                                 (DESCRIPTION_SELECTORS, self.descriptions)):
+            for i, selector in enumerate(selectors):
+                if found[i] is None and _matches(selector, tag, attrs):
+                    found[i] = []
+                    self.text_captures.append(found[i])
+                    opened.append(self.text_captures)
+        for i, selector in enumerate(IMAGE_CONTAINER_SELECTORS):
+            if self.galleries[i] is None and _matches(selector, tag, attrs):
+                self.galleries[i] = []
+                self.gallery_captures.append(self.galleries[i])
+                opened.append(self.gallery_captures)
+
+        if tag == 'img':
+            for gallery in self.gallery_captures:
+                if 'src' in attrs:
+                    gallery.append(attrs['src'])
+                elif 'data-src' in attrs:
+                    gallery.append(attrs['data-src'])
+
+        self.stack.append(opened)
+
+    def end(self, tag):
+        if not self.stack:
+            return
+        if tag in SKIPPED_TEXT_TAGS:
+            self.skip_depth -= 1
+        # Captures opened by an element are the latest ones still active
+        for active in self.stack.pop():
+            active.pop()
+
+    def data(self, data):
+        if self.skip_depth:
+            return
+        for capture in self.text_captures:
+            capture.append(data)
+
+    def close(self) -> Dict:
+        title = next((t for t in self.titles if t is not None), None)
+        description = next((d for d in self.descriptions if d is not None), None)
+        return {
+            'title': ''.join(title).strip() if title is not None else '',
+            'description': ''.join(description).strip() if description is not None else '',
+            'images': _unique_urls(src for gallery in self.galleries if gallery for src in gallery)
+        }
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    Retry transient 502/503/504 responses with exponential backoff
+    """
+    def __init__(self, transport: httpx.BaseTransport, retries: int = 3, backoff_factor: float = 0.3,
+                 status_forcelist: tuple = (502, 503, 504)):
+        self.transport = transport
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = status_forcelist
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.retries + 1):
+            response = self.transport.handle_request(request)
+            if response.status_code not in self.status_forcelist or attempt == self.retries:
+                return response
+            response.close()
+            time.sleep(self.backoff_factor * (2 ** attempt))
+
+    def close(self):
+        self.transport.close()
+
+
+class CacheableResponse(hishel.BaseFilter):
+    """Only cache successful responses, so errors are retried on the next run"""
+    def needs_body(self) -> bool:
+        return False
+
+    def apply(self, item, body) -> bool:
+        return item.status_code == 200
+
 
 class CJScraper:
     def __init__(self):
@@ -14,46 +235,165 @@ class CJScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Upgrade-Insecure-Requests': '1',
         }
+        self.timeout = (3.05, 30)  # (connect, read) seconds
+        # Page cache database; hishel creates the directory on first use
+        self.http_cache_path = os.path.join('.cache', 'hishel', 'cj_http_cache.db')
+        # One long-lived client for page fetches, so concurrent SKUs share
+        # HTTP/2 connections to the CJ host instead of opening one each.
+        # Transient errors are retried, and repeated fetches within a day
+        # are served from a local HTTP cache
+        transport = httpx.HTTPTransport(
+            http2=HTTP2, retries=3,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16))
+        transport = SyncCacheTransport(
+            next_transport=RetryTransport(transport),
+            storage=hishel.SyncSqliteStorage(database_path=self.http_cache_path, default_ttl=24 * 3600),
+            policy=hishel.FilterPolicy(response_filters=[CacheableResponse()]))
+        self.client = httpx.Client(headers=self.headers, transport=transport, follow_redirects=True,
+                                   timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]))
         # Create images directory if it doesn't exist
         self.images_dir = "product_images"
         os.makedirs(self.images_dir, exist_ok=True)
+        # Downloaded images keyed by URL hash, shared by all SKUs
+        self.image_cache_dir = os.path.join(self.images_dir, '.cache')
+        os.makedirs(self.image_cache_dir, exist_ok=True)
+        # Stage downloads in RAM when it is the same filesystem as the cache,
+        # so finished files can be renamed into place; otherwise stage beside it
+        self.staging_dir = self.image_cache_dir
+        if (os.path.isdir('/dev/shm')
+                and os.stat('/dev/shm').st_dev == os.stat(self.image_cache_dir).st_dev):
+            # Per-user directory, used only if it actually ended up writable for us
+            shm_dir = os.path.join('/dev/shm', f"cjdropp-{os.getuid()}")
+            try:
+                os.makedirs(shm_dir, mode=0o700, exist_ok=True)
+            except OSError:
+                pass
+            if os.path.isdir(shm_dir) and os.access(shm_dir, os.W_OK):
+                self.staging_dir = shm_dir
+        # Bound concurrent image downloads instead of sleeping between them,
+        # both per SKU and across all SKUs scraped in parallel
+        self.max_concurrent_downloads = 8
+        self.max_total_downloads = 16
+        self.download_slots = threading.BoundedSemaphore(self.max_total_downloads)
+        self.chunk_size = 64 * 1024
+        # Serialize CSV appends from concurrent scrapes
+        self.csv_lock = threading.Lock()
+        # Open CSV writers, kept across products: filename -> (file, writer)
+        self._csv_writers = {}
+        # Rows buffered by scrape_many before each batched write
+        self.csv_batch_size = 500
         
-    def download_image(self, image_url: str, sku: str, index: int) -> str:
+    async def _download_image_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                    sku_dir: str, image_url: str, sku: str, index: int) -> str:
         """
-        Download an image and save it to the images directory
+        Download an image and save it to the SKU's image directory
         Returns the local path to the saved image
         """
         try:
-            # Create SKU-specific directory
-            sku_dir = os.path.join(self.images_dir, sku)
-            os.makedirs(sku_dir, exist_ok=True)
-            
-            # Get file extension from URL
-            parsed_url = urllib.parse.urlparse(image_url)
-            ext = os.path.splitext(parsed_url.path)[1]
-            if not ext:
-                ext = '.jpg'  # Default to jpg if no extension found
+            # Get file extension from the last path segment of the URL
+            path = image_url.split('?', 1)[0].split('#', 1)[0]
+            dot = path.rfind('.')
+            ext = path[dot:] if dot > path.rfind('/') else '.jpg'  # Default to jpg if no extension found
                 
             # Create filename
             filename = f"{sku}_image_{index}{ext}"
             local_path = os.path.join(sku_dir, filename)
             
-            # Download and save image
-            response = requests.get(image_url, headers=self.headers)
-            response.raise_for_status()
+            # Images shared with other SKUs are only downloaded once
+            key = hashlib.blake2b(image_url.encode(), digest_size=16).hexdigest()
+            cache_path = os.path.join(self.image_cache_dir, f"{key}{ext}")
             
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
-                
-            print(f"Downloaded image {index + 1} for SKU {sku}")
+            # Skip images an earlier run already linked from this URL's cache entry;
+            # any other file at this index may hold a different image
+            if (os.path.exists(local_path) and os.path.exists(cache_path)
+                    and os.path.samefile(local_path, cache_path)):
+                print(f"Image {index + 1} for SKU {sku} already downloaded")
+                return local_path
+            
+            if os.path.exists(cache_path):
+                print(f"Reusing cached image {index + 1} for SKU {sku}")
+            else:
+                # Stream image to disk in chunks rather than holding it in memory
+                tmp_path = os.path.join(self.staging_dir, f"{key}.{uuid.uuid4().hex}.part")
+                try:
+                    async with semaphore, self._download_slot():
+                        async with session.get(image_url) as response:
+                            response.raise_for_status()
+                            async with aiofiles.open(tmp_path, 'wb') as f:
+                                async for chunk in response.content.iter_chunked(self.chunk_size):
+                                    await f.write(chunk)
+                    os.replace(tmp_path, cache_path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                print(f"Downloaded image {index + 1} for SKU {sku}")
+            
+            self._link_image(cache_path, local_path)
             return local_path
             
         except Exception as e:
             print(f"Error downloading image {index + 1} for SKU {sku}: {str(e)}")
             return ""
+    
+    def _link_image(self, cache_path: str, local_path: str):
+        """
+        Hardlink a cached image into a SKU directory, copying if links are unsupported
+        """
+        if os.path.exists(local_path):
+            os.remove(local_path)
+        try:
+            os.link(cache_path, local_path)
+        except OSError:
+            shutil.copyfile(cache_path, local_path)
+    
+    @contextlib.asynccontextmanager
+    async def _download_slot(self):
+        """
+        Hold one of the scraper-wide download slots shared by all threads
+        Polls instead of blocking so the event loop keeps running
+        """
+        while not self.download_slots.acquire(blocking=False):
+            await asyncio.sleep(0.05)
+        try:
+            yield
+        finally:
+            self.download_slots.release()
+    
+    def _image_session(self) -> aiohttp.ClientSession:
+        """Create the aiohttp session used for one batch of image downloads"""
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrent_downloads, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+        return aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout)
+    
+    def download_image(self, image_url: str, sku: str, index: int) -> str:
+        """
+        Download an image and save it to the images directory
+        Returns the local path to the saved image
+        """
+        sku_dir = os.path.join(self.images_dir, sku)
+        os.makedirs(sku_dir, exist_ok=True)
+        
+        async def download() -> str:
+            async with self._image_session() as session:
+                return await self._download_image_async(session, asyncio.Semaphore(1), sku_dir, image_url, sku, index)
+        
+        return asyncio.run(download())
+    
+    async def _download_all(self, image_urls: List[str], sku_dir: str, sku: str) -> List[str]:
+        """
+        Download all images for a SKU concurrently
+        Returns the local paths in the same order as image_urls
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+        async with self._image_session() as session:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(self._download_image_async(session, semaphore, sku_dir, img_url, sku, idx))
+                         for idx, img_url in enumerate(image_urls)]
+        return [task.result() for task in tasks]
         
     def get_product_info(self, sku: str) -> Dict:
         """
@@ -63,39 +403,42 @@ class CJScraper:
             url = f"{self.base_url}{sku}"
             print(f"Fetching from URL: {url}")
             
-            response = requests.get(url, headers=self.headers)
+            response = self.client.get(url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'lxml')
+            # Hand the parser raw bytes so httpx never sniffs or decodes the charset,
+            # passing on the Content-Type charset when the server sent one
+            page = self._parse_product_page(response.content, response.charset_encoding)
             
             # Extract images first
-            image_urls = self._get_images(soup)
+            image_urls = page['images']
             if not image_urls:
                 print("No images found. Checking alternative image containers...")
-                # Try alternative image containers
-                image_urls = self._get_alternative_images(soup)
+                image_urls = page['alternative_images']
             
             local_image_paths = []
             
             if image_urls:
                 # Download each image
                 print(f"\nDownloading images for SKU {sku}...")
-                for idx, img_url in enumerate(image_urls):
+                # Create SKU-specific directory
+                sku_dir = os.path.join(self.images_dir, sku)
+                os.makedirs(sku_dir, exist_ok=True)
+                download_urls = []
+                for img_url in image_urls:
                     if not img_url.startswith('http'):
                         img_url = 'https:' + img_url if img_url.startswith('//') else 'https://' + img_url
-                    local_path = self.download_image(img_url, sku, idx)
-                    if local_path:
-                        local_image_paths.append(local_path)
-                    time.sleep(0.5)  # Small delay between downloads
+                    download_urls.append(img_url)
+                local_image_paths = [path for path in asyncio.run(self._download_all(download_urls, sku_dir, sku)) if path]
             else:
                 print("No images found for this product")
             
             # Extract product details
-            title = self._get_title(soup)
+            title = page['title']
             if not title:
                 print("Warning: Could not find product title")
             
-            description = self._get_description(soup)
+            description = page['description']
             if not description:
                 print("Warning: Could not find product description")
             
@@ -110,75 +453,119 @@ class CJScraper:
             
             return product_data
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error fetching product {sku}: {str(e)}")
             return None
     
-    def _get_title(self, soup: BeautifulSoup) -> str:
-        """Extract product title"""
-        # Try multiple possible title selectors
-        selectors = [
-            ('h1', {'class_': 'product-title'}),
-            ('h1', {'class_': 'title'}),
-            ('div', {'class_': 'product-name'}),
-            ('div', {'class_': 'detail-title'})
-        ]
+    def _parse_product_page(self, content: bytes, encoding: str = None) -> Dict:
+        """
+        Extract title, description and images from a product page
+        encoding is the charset from the HTTP headers, if any; without it the
+        parser detects the charset from the document itself
+        """
+        if encoding:
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = None  # Unknown charset, let the parser detect it
         
-        for tag, attrs in selectors:
-            title_elem = soup.find(tag, attrs)
-            if title_elem:
-                return title_elem.text.strip()
-        return ''
-    
-    def _get_description(self, soup: BeautifulSoup) -> str:
-        """Extract product description"""
-        # Try multiple possible description selectors
-        selectors = [
-            ('div', {'class_': 'product-description'}),
-            ('div', {'class_': 'description'}),
-            ('div', {'class_': 'detail-desc'}),
-            ('div', {'id': 'description'})
-        ]
+        if LexborHTMLParser is not None:
+            return self._parse_with_lexbor(content, encoding)
         
-        for tag, attrs in selectors:
-            desc_elem = soup.find(tag, attrs)
-            if desc_elem:
-                return desc_elem.text.strip()
-        return ''
-    
-    def _get_images(self, soup: BeautifulSoup) -> List[str]:
-        """Extract product images"""
-        images = []
-        # Try multiple possible image containers
-        containers = [
-            ('div', {'class_': 'product-images'}),
-            ('div', {'class_': 'detail-gallery'}),
-            ('div', {'class_': 'product-gallery'})
-        ]
+        # Single streaming pass, without building a tree
+        parser = etree.HTMLParser(target=CJTarget(), encoding=encoding)
+        parser.feed(content)
+        page = parser.close()
+        if not (page['title'] and page['description'] and page['images']):
+            self._fill_from_tree(page, content, encoding)
+        return page
+
+    def _parse_with_lexbor(self, content: bytes, encoding: str = None) -> Dict:
+        """
+        Extract product details with selectolax's Lexbor CSS engine
+        """
+        # The header charset wins; otherwise let Lexbor detect it from BOM or <meta>
+        if encoding:
+            tree = LexborHTMLParser(content.decode(encoding, errors='replace'))
+        else:
+            tree = LexborHTMLParser(content, encoding=True)
+        tree.strip_tags(SKIPPED_TEXT_TAGS)
         
-        for tag, attrs in containers:
-            img_container = soup.find(tag, attrs)
-            if img_container:
-                for img in img_container.find_all('img'):
-                    if 'src' in img.attrs:
-                        images.append(img['src'])
-                    elif 'data-src' in img.attrs:
-                        images.append(img['data-src'])
-        return images
-    
-    def _get_alternative_images(self, soup: BeautifulSoup) -> List[str]:
-        """Try alternative methods to find product images"""
-        images = []
-        # Look for any img tags with specific patterns in src or class
-        for img in soup.find_all('img'):
-            src = img.get('src', '')
-            if any(x in src.lower() for x in ['product', 'goods', 'item', 'detail']):
-                images.append(src)
-            # Check data-src attribute
-            data_src = img.get('data-src', '')
-            if data_src:
-                images.append(data_src)
-        return list(set(images))  # Remove duplicates
+        def first_text(selectors: List[str], fallback: str) -> str:
+            for selector in selectors:
+                node = tree.css_first(selector)
+                if node is not None:
+                    return node.text().strip()
+            node = tree.css_first(fallback)
+            return node.text().strip() if node is not None else ''
+        
+        def image_src(node) -> str:
+            attrs = node.attributes
+            return attrs['src'] if 'src' in attrs else attrs.get('data-src')
+        
+        image_urls = []
+        for selector in IMAGE_CONTAINER_CSS:
+            container = tree.css_first(selector)
+            if container is not None:
+                image_urls.extend(image_src(img) for img in container.css('img'))
+        if not image_urls:
+            image_urls = [image_src(img) for img in tree.css(IMAGES_FALLBACK_CSS)]
+        
+        page = {
+            'title': first_text(TITLE_CSS, TITLE_FALLBACK_CSS),
+            'description': first_text(DESCRIPTION_CSS, DESCRIPTION_FALLBACK_CSS),
+            'images': _unique_urls(image_urls)
+        }
+        if not page['images']:
+            # Try alternative image containers
+            alternative_images = []
+            for img in tree.css('img'):
+                src = img.attributes.get('src') or ''
+                if any(x in src.lower() for x in ALTERNATIVE_IMAGE_PATTERNS):
+                    alternative_images.append(src)
+                # Check data-src attribute
+                alternative_images.append(img.attributes.get('data-src'))
+            page['alternative_images'] = _unique_urls(alternative_images)
+        return page
+
+    def _fill_from_tree(self, page: Dict, content: bytes, encoding: str = None):
+        """
+        Fill fields the streaming pass missed using the fallback XPaths
+        """
+        try:
+            tree = lxml.html.fromstring(content, parser=lxml.html.HTMLParser(encoding=encoding))
+        except etree.ParserError:
+            # Empty document, so there is nothing more to find
+            page.setdefault('alternative_images', [])
+            return
+        etree.strip_elements(tree, *SKIPPED_TEXT_TAGS, with_tail=False)
+        if not page['title']:
+            title_elem = (TITLE_XPATH(tree) or [None])[0]
+            if title_elem is not None:
+                page['title'] = title_elem.text_content().strip()
+        if not page['description']:
+            desc_elem = (DESCRIPTION_XPATH(tree) or [None])[0]
+            if desc_elem is not None:
+                page['description'] = desc_elem.text_content().strip()
+        if not page['images']:
+            page['images'] = _unique_urls(IMAGES_XPATH(tree))
+            # Try alternative image containers
+            page['alternative_images'] = _unique_urls(ALTERNATIVE_IMAGES_XPATH(tree))
+
+    def _get_csv_writer(self, filename: str) -> csv.DictWriter:
+        """
+        Return the open writer for filename, opening it on first use
+        Must be called with csv_lock held
+        """
+        if filename not in self._csv_writers:
+            fh = open(filename, 'a', newline='', encoding='utf-8')
+            # Match the os.linesep endings of files written by earlier versions
+            writer = csv.DictWriter(fh, fieldnames=CSV_FIELDNAMES, lineterminator=os.linesep)
+            # Only a new or empty file needs headers
+            if fh.tell() == 0:
+                writer.writeheader()
+            self._csv_writers[filename] = (fh, writer)
+        return self._csv_writers[filename][1]
 
     def save_to_csv(self, product_data: Dict, filename: str = 'products.csv'):
         """
@@ -187,40 +574,97 @@ class CJScraper:
         if not product_data:
             return
         
-        # Convert to DataFrame
-        df = pd.DataFrame([product_data])
+        with self.csv_lock:
+            self._get_csv_writer(filename).writerow(product_data)
+            # Single saves are interactive, so make the row visible right away
+            self._csv_writers[filename][0].flush()
         
-        # Check if file exists to determine if we need to write headers
-        file_exists = os.path.isfile(filename)
+        print(f"Product information saved to {filename}")
+
+    def save_many_to_csv(self, rows: List[Dict], filename: str = 'products.csv'):
+        """
+        Save a batch of product information to CSV file in one write
+        """
+        if not rows:
+            return
         
-        # Save to CSV
-        df.to_csv(filename, mode='a' if file_exists else 'w',
-                 header=not file_exists, index=False)
+        with self.csv_lock:
+            self._get_csv_writer(filename).writerows(rows)
+            # Once per batch, so the rows are on disk when reported as saved
+            self._csv_writers[filename][0].flush()
         
-        print(f"Product information saved to {filename}")
+        print(f"{len(rows)} products saved to {filename}")
+
+    def close(self):
+        """
+        Close the HTTP client and flush and close any open CSV files
+        """
+        self.client.close()
+        with self.csv_lock:
+            for fh, _ in self._csv_writers.values():
+                fh.close()
+            self._csv_writers.clear()
+
+    def scrape_many(self, skus: List[str], workers: int = 16) -> List[Dict]:
+        """
+        Scrape several SKUs concurrently and save them in batches as they complete
+        Returns the product data of the SKUs that were fetched successfully
+        """
+        results = []
+        rows = []
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(self.get_product_info, s): s for s in skus}
+            for future in as_completed(futures):
+                sku = futures[future]
+                try:
+                    product_data = future.result()
+                except Exception as e:
+                    print(f"Error scraping product {sku}: {str(e)}")
+                    continue
+                
+                if product_data:
+                    rows.append(product_data)
+                    results.append(product_data)
+                    if len(rows) >= self.csv_batch_size:
+                        self.save_many_to_csv(rows)
+                        rows = []
+                else:
+                    print(f"\nFailed to fetch product information for SKU: {sku}")
+        self.save_many_to_csv(rows)
+        return results
 
 def main():
     scraper = CJScraper()
     
-    while True:
-        sku = input("\nEnter product SKU (or 'quit' to exit): ").strip()
+    try:
+        # Batch mode: SKUs given on the command line are scraped concurrently
+        skus = [sku.strip() for sku in sys.argv[1:] if sku.strip()]
+        if skus:
+            results = scraper.scrape_many(skus)
+            print(f"\nSuccessfully scraped {len(results)} of {len(skus)} products")
+            return
         
-        if sku.lower() == 'quit':
-            break
+        while True:
+            sku = input("\nEnter product SKU (or 'quit' to exit): ").strip()
             
-        if not sku:
-            print("Please enter a valid SKU")
-            continue
+            if sku.lower() == 'quit':
+                break
+                
+            if not sku:
+                print("Please enter a valid SKU")
+                continue
+                
+            print(f"\nFetching information for SKU: {sku}")
+            product_data = scraper.get_product_info(sku)
             
-        print(f"\nFetching information for SKU: {sku}")
-        product_data = scraper.get_product_info(sku)
-        
-        if product_data:
-            scraper.save_to_csv(product_data)
-            print(f"\nSuccessfully scraped product: {product_data['title']}")
-            print(f"Images saved in: {os.path.join(scraper.images_dir, sku)}")
-        else:
-            print(f"\nFailed to fetch product information for SKU: {sku}")
+            if product_data:
+                scraper.save_to_csv(product_data)
+                print(f"\nSuccessfully scraped product: {product_data['title']}")
+                print(f"Images saved in: {os.path.join(scraper.images_dir, sku)}")
+            else:
+                print(f"\nFailed to fetch product information for SKU: {sku}")
+    finally:
+        scraper.close()
 
 if __name__ == "__main__":
     main()